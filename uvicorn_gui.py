@@ -1,19 +1,27 @@
 import ast
+import hashlib
+import http.client
 import ipaddress
 import os
 import signal
 import socket
+import statistics
+import struct
 import subprocess
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-from PyQt6.QtCore import QProcess, QTimer, Qt
+from PyQt6.QtCore import QObject, QProcess, QStandardPaths, QTimer, Qt, pyqtSignal
 from PyQt6.QtGui import QMouseEvent, QColor, QFont, QIcon, QAction
 from PyQt6.QtWidgets import (
     QApplication,
     QCheckBox,
     QComboBox,
+    QDoubleSpinBox,
     QFileDialog,
     QFrame,
     QHBoxLayout,
@@ -84,7 +92,7 @@ QLabel.field_label {
 }
 
 /* 5. 输入控件 */
-QLineEdit, QSpinBox, QComboBox {
+QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox {
     background-color: #F9FAFB;
     border: 1px solid #E5E7EB;
     border-radius: 6px;
@@ -93,7 +101,7 @@ QLineEdit, QSpinBox, QComboBox {
     font-family: 'Consolas', monospace;
     font-size: 10pt;
 }
-QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
+QLineEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus {
     background-color: #FFFFFF;
     border-color: #3B82F6;
 }
@@ -205,11 +213,287 @@ class AppParser:
         return variables
 
 
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "content-length",
+}
+
+
+class TrafficRecorder:
+    """二进制请求录制文件: 头部 MAGIC，随后每条记录为
+    <offset:f64><duration:f64><status:u16> + 4 个 u32 长度前缀字段 (method, path, headers, body)。
+    每条记录写完即 flush，录制过程中也能读取；末尾不完整的记录会被忽略。"""
+
+    MAGIC = b"UVREC2\n"
+    RECORD = struct.Struct("<ddH")
+    LENGTH = struct.Struct("<I")
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.count = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, "xb")
+        self._file.write(self.MAGIC)
+        self._file.flush()
+
+    def write(self, offset: float, duration: float, status: int, method: str, path: str,
+              headers: list[tuple[str, str]], body: bytes):
+        header_blob = "".join(f"{k}: {v}\r\n" for k, v in headers).encode("latin-1", "replace")
+        chunks = [self.RECORD.pack(offset, duration, status)]
+        for field in (method.encode("ascii"), path.encode("latin-1", "replace"), header_blob, body):
+            chunks.append(self.LENGTH.pack(len(field)))
+            chunks.append(field)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @classmethod
+    def read(cls, path: str) -> list[dict]:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(cls.MAGIC):
+            raise ValueError("不是有效的录制文件")
+        records = []
+        pos = len(cls.MAGIC)
+        while pos + cls.RECORD.size <= len(data):
+            offset, duration, status = cls.RECORD.unpack_from(data, pos)
+            end = pos + cls.RECORD.size
+            fields = []
+            for _ in range(4):
+                if end + cls.LENGTH.size > len(data):
+                    break
+                (size,) = cls.LENGTH.unpack_from(data, end)
+                end += cls.LENGTH.size
+                if end + size > len(data):
+                    break
+                fields.append(data[end:end + size])
+                end += size
+            if len(fields) < 4:
+                # 正在写入的最后一条记录
+                break
+            pos = end
+            method, req_path, header_blob, body = fields
+            headers = []
+            for line in header_blob.decode("latin-1").split("\r\n"):
+                if line:
+                    k, _, v = line.partition(": ")
+                    headers.append((k, v))
+            records.append({
+                "offset": offset,
+                "duration": duration,
+                "status": status,
+                "method": method.decode("ascii"),
+                "path": req_path.decode("latin-1"),
+                "headers": headers,
+                "body": body,
+            })
+        return records
+
+
+class _RecordingProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _forward(self):
+        server = self.server
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            # 分块请求体不做转发，直接拒绝并关闭连接，避免残留数据破坏 keep-alive
+            self.send_error(411, "Chunked request bodies are not supported by the recording proxy")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_error(400, "Invalid Content-Length")
+            return
+        body = self.rfile.read(length) if length else b""
+        headers = [(k, v) for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS]
+
+        started = time.monotonic()
+        conn = http.client.HTTPConnection(server.backend_host, server.backend_port, timeout=60)
+        try:
+            conn.putrequest(self.command, self.path, skip_host=True, skip_accept_encoding=True)
+            for k, v in headers:
+                conn.putheader(k, v)
+            if body or self.command in ("POST", "PUT", "PATCH"):
+                conn.putheader("Content-Length", str(len(body)))
+            conn.endheaders(body or None)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException):
+            self.send_error(502, "Backend unavailable")
+            return
+        finally:
+            conn.close()
+        duration = time.monotonic() - started
+
+        is_head = self.command == "HEAD"
+        no_body = resp.status in (204, 304) or resp.status < 200
+        self.send_response_only(resp.status, resp.reason)
+        for k, v in resp.getheaders():
+            name = k.lower()
+            if name in HOP_BY_HOP_HEADERS and not (is_head and name == "content-length"):
+                continue
+            self.send_header(k, v)
+        if not is_head and not no_body:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not is_head and not no_body:
+            self.wfile.write(data)
+
+        recorder = server.recorder
+        recorder.write(started - recorder.started_at, duration, resp.status, self.command, self.path, headers, body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _forward
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingProxy:
+    """在配置端口上监听，把请求转发给实际运行的 Uvicorn 并写入录制文件。"""
+
+    def __init__(self, listen_host: str, listen_port: int, backend_port: int):
+        self.recorder = None
+        self.server = ThreadingHTTPServer((listen_host, listen_port), _RecordingProxyHandler)
+        self.server.backend_host = "127.0.0.1"
+        self.server.backend_port = backend_port
+
+    def start(self, recorder: TrafficRecorder):
+        self.recorder = recorder
+        self.server.recorder = recorder
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self.recorder is not None:
+            self.server.shutdown()
+        self.server.server_close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+class TrafficReplayer(QObject):
+    """按录制时的时间间隔 (除以倍速) 重放请求，完成后通过信号回到 GUI 线程汇报结果。"""
+
+    finished = pyqtSignal(list)
+
+    def __init__(self, records: list[dict], host: str, port: int, rate: float, parent=None):
+        super().__init__(parent)
+        # 记录在响应完成时写入，需按请求开始时间排序，并从第一个请求开始计时
+        self.records = sorted(records, key=lambda r: r["offset"])
+        self.base_offset = self.records[0]["offset"] if self.records else 0.0
+        self.host = host
+        self.port = port
+        self.rate = rate
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _send(self, record: dict):
+        started = time.monotonic()
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        try:
+            conn.putrequest(record["method"], record["path"], skip_accept_encoding=True)
+            for k, v in record["headers"]:
+                if k.lower() != "host":
+                    conn.putheader(k, v)
+            body = record["body"]
+            if body or record["method"] in ("POST", "PUT", "PATCH"):
+                conn.putheader("Content-Length", str(len(body)))
+            conn.endheaders(body or None)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            return None
+        finally:
+            conn.close()
+        return time.monotonic() - started, resp.status
+
+    def _run(self):
+        # 无论回放中出现什么异常都要发出 finished，否则界面会一直停留在“回放进行中”
+        lines = [">> 回放异常中止。"]
+        try:
+            t0 = time.monotonic()
+            futures = []
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                for record in self.records:
+                    delay = t0 + (record["offset"] - self.base_offset) / self.rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    futures.append(pool.submit(self._send, record))
+            results = [f.result() for f in futures]
+            lines = self.compare(self.records, results, self.rate)
+        except Exception as e:
+            lines = [f">> 回放异常中止: {e!r}"]
+        finally:
+            self.finished.emit(lines)
+
+    @staticmethod
+    def compare(records: list[dict], results: list, rate: float) -> list[str]:
+        endpoints = {}
+        failed = 0
+        for record, replayed in zip(records, results):
+            if replayed is None:
+                failed += 1
+                continue
+            key = f"{record['method']} {record['path'].split('?', 1)[0]}"
+            recorded_list, replayed_list, mismatches = endpoints.setdefault(key, ([], [], {}))
+            duration, status = replayed
+            if status != record["status"]:
+                # 状态码变化 (路由改动、凭据过期等) 的延迟不可比，只计数不参与 p50
+                pair = (record["status"], status)
+                mismatches[pair] = mismatches.get(pair, 0) + 1
+                continue
+            recorded_list.append(record["duration"])
+            replayed_list.append(duration)
+
+        lines = [f">> 回放完成: {len(records)} 个请求，倍速 {rate:g}x，失败 {failed}"]
+        rows = []
+        for key, (recorded_list, replayed_list, mismatches) in endpoints.items():
+            if recorded_list:
+                before = statistics.median(recorded_list) * 1000
+                after = statistics.median(replayed_list) * 1000
+                delta = after - before
+            else:
+                before = after = delta = None
+            rows.append((delta, key, len(recorded_list), before, after, mismatches))
+        rows.sort(key=lambda r: abs(r[0]) if r[0] is not None else -1, reverse=True)
+        for delta, key, count, before, after, mismatches in rows:
+            if delta is None:
+                line = f">>   {key}  无可比样本"
+            else:
+                pct = f"{delta / before * 100:+.1f}%" if before else "n/a"
+                line = f">>   {key}  x{count}  p50 {before:.1f}ms → {after:.1f}ms  ({delta:+.1f}ms, {pct})"
+            if mismatches:
+                detail = ", ".join(f"{a}→{b} x{n}" for (a, b), n in sorted(mismatches.items()))
+                line += f"  状态不一致: {detail}"
+            lines.append(line)
+        return lines
+
+
 class UvicornController(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Uvicorn Launcher")
-        self.resize(720, 550)
+        self.resize(720, 600)
 
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
@@ -219,11 +503,40 @@ class UvicornController(QMainWindow):
         self.module_stem = ""
         self.last_pid = 0
 
+        # 字节码预编译 / 就绪计时 (按 work_dir + 解释器 区分)
+        self.prewarm_queue = []
+        self.prewarm_key = None
+        self.prewarm_started_at = 0.0
+        self.prewarm_compiled = 0
+        self.prewarm_errors = 0
+        self.prewarm_venv = ""
+        self.prewarm_venv_signature = ()
+        self.pending_launch = None
+        self.prewarmed_keys = set()
+        self.venv_signatures = {}
+        self.prewarm_offloaded = {}
+        self.ready_key = None
+        self.ready_kind = ""
+        self.start_clicked_at = 0.0
+        self.ready_started_at = None
+
+        # 流量录制 / 回放
+        self.proxy = None
+        self.replayer = None
+        self.replay_target = None
+        self.last_record_path = ""
+
         self.process = QProcess(self)
         self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
         self.process.started.connect(self.on_started)
         self.process.finished.connect(self.on_finished)
         self.process.readyReadStandardOutput.connect(self.on_output)
+        self.process.errorOccurred.connect(self.on_process_error)
+
+        self.prewarm_process = QProcess(self)
+        self.prewarm_process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.prewarm_process.finished.connect(self.on_prewarm_finished)
+        self.prewarm_process.errorOccurred.connect(self.on_prewarm_error)
 
         self._init_ui()
         self._init_tray()
@@ -299,6 +612,7 @@ class UvicornController(QMainWindow):
         self.python_input = QLineEdit()
         self.python_input.setPlaceholderText("选择 Python 解释器 (python.exe)")
         self.python_input.setFixedHeight(32)
+        self.python_input.editingFinished.connect(self.schedule_prewarm)
 
         self.python_browse_btn = QPushButton("浏览...")
         self.python_browse_btn.setObjectName("browse_btn")
@@ -369,19 +683,67 @@ class UvicornController(QMainWindow):
         self.reload_check = QCheckBox("开启热重载 (Auto Reload)")
         self.reload_check.setChecked(True)
 
+        self.prewarm_check = QCheckBox("预编译字节码")
+        self.prewarm_check.setChecked(True)
+        self.prewarm_check.setToolTip("启动前用所选解释器并行执行 compileall，已是最新的 .pyc 会跳过")
+        self.prewarm_check.toggled.connect(self.schedule_prewarm)
+
+        self.prewarm_venv_check = QCheckBox("含 venv")
+        self.prewarm_venv_check.setToolTip("同时预编译解释器所在虚拟环境 (site-packages)")
+
         self.main_btn = QPushButton("启动服务")
         self.main_btn.setObjectName("action_btn_start")
         self.main_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.main_btn.clicked.connect(self.toggle_service)
 
         action_layout.addWidget(self.reload_check)
+        action_layout.addWidget(self.prewarm_check)
+        action_layout.addWidget(self.prewarm_venv_check)
         action_layout.addStretch()
         action_layout.addWidget(self.main_btn)
 
+        # Row 4: Traffic record / replay
+        traffic_layout = QHBoxLayout()
+        traffic_layout.setSpacing(10)
+
+        self.record_check = QCheckBox("录制流量 (本地代理)")
+        self.record_check.setToolTip("在 Port 上启动录制代理，Uvicorn 改为监听内部端口")
+
+        lbl_rate = QLabel("回放倍速")
+        lbl_rate.setProperty("class", "field_label")
+
+        self.replay_rate_input = QDoubleSpinBox()
+        self.replay_rate_input.setRange(0.1, 100.0)
+        self.replay_rate_input.setSingleStep(0.5)
+        self.replay_rate_input.setValue(1.0)
+        self.replay_rate_input.setSuffix("x")
+        self.replay_rate_input.setButtonSymbols(QDoubleSpinBox.ButtonSymbols.NoButtons)
+        self.replay_rate_input.setFixedSize(80, 32)
+
+        self.replay_btn = QPushButton("回放最近")
+        self.replay_btn.setObjectName("browse_btn")
+        self.replay_btn.setFixedSize(80, 32)
+        self.replay_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.replay_btn.clicked.connect(self.replay_latest)
+
+        self.replay_choose_btn = QPushButton("选择录制...")
+        self.replay_choose_btn.setObjectName("browse_btn")
+        self.replay_choose_btn.setFixedSize(90, 32)
+        self.replay_choose_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.replay_choose_btn.clicked.connect(self.browse_recording)
+
+        traffic_layout.addWidget(self.record_check)
+        traffic_layout.addStretch()
+        traffic_layout.addWidget(lbl_rate)
+        traffic_layout.addWidget(self.replay_rate_input)
+        traffic_layout.addWidget(self.replay_btn)
+        traffic_layout.addWidget(self.replay_choose_btn)
+
         control_layout.addLayout(py_layout)
         control_layout.addLayout(file_layout)
         control_layout.addLayout(grid)
         control_layout.addLayout(action_layout)
+        control_layout.addLayout(traffic_layout)
 
         # === C. 日志区域 (带独立工具栏) ===
         log_wrapper = QWidget()
@@ -473,6 +835,7 @@ class UvicornController(QMainWindow):
             return
         self.python_input.setText(path)
         self.python_input.setToolTip(path)
+        self.schedule_prewarm()
 
     def guess_python_from_project(self, file_path: str) -> str:
         p = Path(file_path).resolve()
@@ -490,6 +853,8 @@ class UvicornController(QMainWindow):
 
     def load_file(self, path):
         p = Path(path)
+        if str(p.parent) != self.work_dir:
+            self.last_record_path = ""
         self.work_dir = str(p.parent)
         self.module_stem = p.stem
         self.path_input.setText(p.name)
@@ -505,18 +870,21 @@ class UvicornController(QMainWindow):
             guessed = self.guess_python_from_project(path)
             if guessed:
                 self.set_python_path(guessed)
+        self.schedule_prewarm()
 
     def is_running(self) -> bool:
         return self.process.state() == QProcess.ProcessState.Running
 
     def toggle_service(self):
-        if self.is_running():
+        if self.pending_launch is not None:
+            self.cancel_pending_start()
+        elif self.is_running():
             self.stop_service()
         else:
             self.start_service()
 
     def start_service(self):
-        if self.is_running():
+        if self.is_running() or self.pending_launch is not None:
             return
 
         python_path = self.python_input.text().strip()
@@ -539,6 +907,20 @@ class UvicornController(QMainWindow):
             return
         port = self.port_input.value()
 
+        # 固定本次启动的 work_dir，等待预编译期间切换入口文件不会影响这次启动
+        launch = (self.work_dir, python_path, target, host, port)
+        self.start_clicked_at = time.monotonic()
+        if self.prewarm_check.isChecked():
+            # 增量预编译很快 (新鲜的 .pyc 直接跳过)，跑完再启动，切换分支后也能命中缓存；
+            # venv 只在 site-packages 有变化时才重新扫描。
+            self.pending_launch = launch
+            self.main_btn.setText("取消启动")
+            self.log_view.appendPlainText(">> 正在预编译字节码，完成后启动服务...")
+            self.start_prewarm((self.work_dir, python_path), include_venv=self.prewarm_venv_check.isChecked())
+            return
+        self._launch_service(launch, warm=False)
+
+    def build_uvicorn_cmd(self, python_path: str, target: str, host: str, port: int) -> list[str]:
         cmd = [
             python_path,
             "-m",
@@ -551,11 +933,270 @@ class UvicornController(QMainWindow):
         ]
         if self.reload_check.isChecked():
             cmd.append("--reload")
-
-        self.process.setWorkingDirectory(self.work_dir)
+        return cmd
+
+    def _launch_service(self, launch: tuple, warm: bool):
+        work_dir, python_path, target, host, port = launch
+        bind_host, bind_port = host, port
+        self.replay_target = ("127.0.0.1" if host == "0.0.0.0" else host, port)
+        if self.record_check.isChecked():
+            backend_port = self._start_proxy(work_dir, host, port)
+            if backend_port:
+                bind_host, bind_port = "127.0.0.1", backend_port
+                self.replay_target = ("127.0.0.1", backend_port)
+
+        cmd = self.build_uvicorn_cmd(python_path, target, bind_host, bind_port)
+        self.ready_key = (work_dir, python_path)
+        self.ready_kind = "prewarmed" if warm else "plain"
+        self.ready_started_at = time.monotonic()
+        self.process.setWorkingDirectory(work_dir)
         self.process.start(cmd[0], cmd[1:])
         self.log_view.appendPlainText(f">> 正在启动服务: {target}")
 
+    def cancel_pending_start(self):
+        self.pending_launch = None
+        self.main_btn.setText("启动服务")
+        self._abort_prewarm()
+        self.log_view.appendPlainText(">> 已取消启动。")
+
+    # --- Traffic Record / Replay ---
+    @staticmethod
+    def recordings_dir() -> Path:
+        # 录制包含完整请求头 (含 Cookie/Authorization)，放在应用数据目录而不是项目目录，避免被误提交
+        base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        return Path(base or Path.home() / ".uvicorn_gui") / "recordings"
+
+    def project_recordings_dir(self, work_dir: str) -> Path:
+        # 按完整路径区分项目，同名目录或名称前缀相同的项目不会共用录制
+        resolved = str(Path(work_dir).resolve())
+        digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:12]
+        return self.recordings_dir() / f"{Path(resolved).name}-{digest}"
+
+    def new_record_path(self, work_dir: str) -> str:
+        folder = self.project_recordings_dir(work_dir)
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        path = folder / f"{stamp}.uvrec"
+        n = 1
+        while path.exists():
+            path = folder / f"{stamp}-{n}.uvrec"
+            n += 1
+        return str(path)
+
+    def latest_record_path(self) -> str:
+        if self.last_record_path and Path(self.last_record_path).exists():
+            return self.last_record_path
+        files = list(self.project_recordings_dir(self.work_dir).glob("*.uvrec"))
+        return str(max(files, key=lambda f: f.stat().st_mtime)) if files else ""
+
+    def _start_proxy(self, work_dir: str, host: str, port: int) -> int:
+        # 代理占用配置端口，Uvicorn 改为监听一个空闲的内部端口
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            backend_port = s.getsockname()[1]
+        try:
+            proxy = RecordingProxy(host, port, backend_port)
+        except OSError as e:
+            self.log_view.appendPlainText(f">> 录制代理启动失败，直接启动服务: {e}")
+            return 0
+        try:
+            recorder = TrafficRecorder(self.new_record_path(work_dir))
+        except OSError as e:
+            proxy.stop()
+            self.log_view.appendPlainText(f">> 无法创建录制文件，直接启动服务: {e}")
+            return 0
+        self.proxy = proxy
+        self.proxy.start(recorder)
+        self.last_record_path = recorder.path
+        self.log_view.appendPlainText(
+            f">> 录制代理: {host}:{port} → 127.0.0.1:{backend_port}，写入 {recorder.path}"
+        )
+        return backend_port
+
+    def _stop_proxy(self):
+        if self.proxy is None:
+            return
+        proxy, self.proxy = self.proxy, None
+        proxy.stop()
+        self.log_view.appendPlainText(f">> 录制已保存: {proxy.recorder.count} 个请求")
+
+    def replay_latest(self):
+        path = self.latest_record_path() if self.work_dir else ""
+        if not path:
+            self.log_view.appendPlainText(">> 没有找到当前项目的录制文件。")
+            return
+        self.replay_traffic(path)
+
+    def browse_recording(self):
+        f, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择录制文件",
+            str(self.recordings_dir()),
+            "Recording (*.uvrec);;All Files (*)",
+        )
+        if f:
+            self.replay_traffic(f)
+
+    def replay_traffic(self, path: str):
+        if self.replayer is not None:
+            self.log_view.appendPlainText(">> 回放进行中，请稍候。")
+            return
+        if not self.is_running() or self.replay_target is None:
+            self.log_view.appendPlainText(">> 请先启动服务再回放。")
+            return
+        try:
+            records = TrafficRecorder.read(path)
+        except (OSError, ValueError) as e:
+            self.log_view.appendPlainText(f">> 无法读取录制文件 {path}: {e}")
+            return
+        if not records:
+            self.log_view.appendPlainText(">> 录制文件中没有请求。")
+            return
+
+        rate = self.replay_rate_input.value()
+        host, port = self.replay_target
+        self.replayer = TrafficReplayer(records, host, port, rate, self)
+        self.replayer.finished.connect(self.on_replay_finished)
+        self.replayer.start()
+        self.replay_btn.setEnabled(False)
+        self.replay_choose_btn.setEnabled(False)
+        self.log_view.appendPlainText(f">> 正在回放 {len(records)} 个请求 ({rate:g}x) → {host}:{port}")
+
+    def on_replay_finished(self, lines: list):
+        self.replayer.deleteLater()
+        self.replayer = None
+        self.replay_btn.setEnabled(True)
+        self.replay_choose_btn.setEnabled(True)
+        for line in lines:
+            self.log_view.appendPlainText(line)
+
+    # --- Bytecode Prewarm ---
+    def prewarm_key_for_current(self):
+        python_path = self.python_input.text().strip()
+        if not self.work_dir or not python_path or not Path(python_path).exists():
+            return None
+        return (self.work_dir, python_path)
+
+    @staticmethod
+    def find_venv_root(python_path: str) -> str:
+        # <venv>/Scripts/python.exe 或 <venv>/bin/python，不做 resolve 以免跟随符号链接到基础解释器
+        root = Path(python_path).parent.parent
+        if (root / "pyvenv.cfg").exists():
+            return str(root)
+        return ""
+
+    @staticmethod
+    def venv_signature(venv_root: str) -> tuple:
+        # pip 安装/卸载会增删 site-packages 下的目录，从而改变其 mtime
+        root = Path(venv_root)
+        dirs = [*root.glob("Lib/site-packages"), *root.glob("lib/python*/site-packages")]
+        return tuple(sorted((str(d), d.stat().st_mtime_ns) for d in dirs))
+
+    def schedule_prewarm(self):
+        # 选择项目或解释器后在后台预热，不阻塞界面
+        if not self.prewarm_check.isChecked() or self.is_running() or self.pending_launch is not None:
+            return
+        key = self.prewarm_key_for_current()
+        if key is None or key in self.prewarmed_keys:
+            return
+        if self.prewarm_key == key and self.prewarm_process.state() != QProcess.ProcessState.NotRunning:
+            return
+        self.start_prewarm(key, include_venv=self.prewarm_venv_check.isChecked())
+
+    def start_prewarm(self, key: tuple, include_venv: bool):
+        self._abort_prewarm()
+        work_dir, python_path = key
+        # -j 0: compileall 使用进程池 (每核一个 worker)；不加 -f，时间戳未变的 .pyc 直接跳过
+        base = [python_path, "-m", "compileall", "-j", "0"]
+        self.prewarm_queue = [
+            base + ["-x", r"[\\/](\.git|\.venv|venv|env|node_modules|__pycache__)([\\/]|$)", work_dir],
+        ]
+        venv_root = self.find_venv_root(python_path) if include_venv else ""
+        self.prewarm_venv = ""
+        if venv_root:
+            signature = self.venv_signature(venv_root)
+            if self.venv_signatures.get(venv_root) != signature:
+                self.prewarm_queue.append(base + [venv_root])
+                self.prewarm_venv = venv_root
+                self.prewarm_venv_signature = signature
+        self.prewarm_key = key
+        self.prewarm_started_at = time.monotonic()
+        self.prewarm_compiled = 0
+        self.prewarm_errors = 0
+        self._run_next_prewarm()
+
+    def _run_next_prewarm(self):
+        cmd = self.prewarm_queue.pop(0)
+        self.prewarm_process.setWorkingDirectory(self.prewarm_key[0])
+        self.prewarm_process.start(cmd[0], cmd[1:])
+
+    def _abort_prewarm(self):
+        self.prewarm_queue = []
+        if self.prewarm_process.state() != QProcess.ProcessState.NotRunning:
+            self.prewarm_process.blockSignals(True)
+            # compileall -j 的进程池 worker 是子进程，先同步结束整棵进程树，避免父进程退出后残留
+            self._kill_process_tree_sync(self.prewarm_process.processId())
+            self.prewarm_process.kill()
+            self.prewarm_process.waitForFinished(1000)
+            self.prewarm_process.blockSignals(False)
+
+    def on_prewarm_finished(self):
+        out = self.prewarm_process.readAllStandardOutput().data().decode("utf-8", "ignore")
+        for line in out.splitlines():
+            if line.startswith("Compiling "):
+                self.prewarm_compiled += 1
+            elif line.startswith("*** "):
+                self.prewarm_errors += 1
+        if self.prewarm_queue:
+            self._run_next_prewarm()
+            return
+
+        elapsed = time.monotonic() - self.prewarm_started_at
+        self.prewarmed_keys.add(self.prewarm_key)
+        if self.prewarm_venv:
+            self.venv_signatures[self.prewarm_venv] = self.prewarm_venv_signature
+        if self.pending_launch is None and self.prewarm_compiled:
+            # 后台完成的编译不会再出现在下次启动路径上，记下来在就绪时汇报
+            files, seconds = self.prewarm_offloaded.get(self.prewarm_key, (0, 0.0))
+            self.prewarm_offloaded[self.prewarm_key] = (files + self.prewarm_compiled, seconds + elapsed)
+        msg = f">> 字节码预编译完成: 编译 {self.prewarm_compiled} 个文件，耗时 {elapsed:.2f}s"
+        if self.prewarm_errors:
+            msg += f"，{self.prewarm_errors} 个文件编译失败"
+        self.log_view.appendPlainText(msg)
+        self._finish_prewarm()
+
+    def on_prewarm_error(self, error):
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+        self.prewarm_queue = []
+        self.log_view.appendPlainText(">> 字节码预编译无法启动，跳过预热。")
+        self._finish_prewarm(warm=False)
+
+    def _finish_prewarm(self, warm: bool = True):
+        launch, self.pending_launch = self.pending_launch, None
+        if launch is not None:
+            self._launch_service(launch, warm)
+
+    def _on_ready(self):
+        if self.ready_started_at is None:
+            return
+        now = time.monotonic()
+        startup = now - self.ready_started_at
+        self.ready_started_at = None
+        if self.ready_kind == "reload":
+            self.log_view.appendPlainText(f">> 重载就绪耗时 {startup:.2f}s")
+            return
+        # 从点击启动算起，预热启动包含用户实际等待的预编译时间
+        total = now - self.start_clicked_at
+        if self.ready_kind == "plain":
+            self.log_view.appendPlainText(f">> 服务就绪: 总耗时 {total:.2f}s")
+            return
+        msg = f">> 服务就绪: 总耗时 {total:.2f}s (预编译 {total - startup:.2f}s + 启动 {startup:.2f}s)"
+        files, seconds = self.prewarm_offloaded.pop(self.ready_key, (0, 0.0))
+        if files:
+            msg += f"；后台预编译已提前完成 {files} 个文件 (耗时 {seconds:.2f}s)，这部分编译不再计入启动"
+        self.log_view.appendPlainText(msg)
+
     def _validate_host(self, host: str) -> bool:
         if not host:
             self.log_view.appendPlainText(">> Host 不能为空。")
@@ -613,6 +1254,24 @@ class UvicornController(QMainWindow):
         finally:
             pass
 
+    def _kill_process_tree_sync(self, pid: int):
+        if not pid:
+            return
+        if sys.platform.startswith("win"):
+            cmd = ["taskkill", "/PID", str(pid), "/T", "/F"]
+        else:
+            cmd = ["pkill", "-KILL", "-P", str(pid)]
+        kwargs = {
+            "stdout": subprocess.DEVNULL,
+            "stderr": subprocess.DEVNULL,
+        }
+        if sys.platform.startswith("win") and hasattr(subprocess, "CREATE_NO_WINDOW"):
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        try:
+            subprocess.run(cmd, timeout=5, **kwargs)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            pass
+
     def _run_kill_command_async(self, cmd: list[str]):
         def _worker():
             try:
@@ -647,6 +1306,16 @@ class UvicornController(QMainWindow):
         self.app_combo.setEnabled(False)
         self.python_input.setEnabled(False)
         self.python_browse_btn.setEnabled(False)
+        self.record_check.setEnabled(False)
+
+    def on_process_error(self, error):
+        # FailedToStart 时不会触发 finished，需要在这里释放代理占用的端口
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+        self.ready_started_at = None
+        self.main_btn.setText("启动服务")
+        self._stop_proxy()
+        self.log_view.appendPlainText(f">> 服务启动失败: {self.process.errorString()}")
 
     def on_finished(self):
         self.status_label.setText("● 已停止")
@@ -654,10 +1323,13 @@ class UvicornController(QMainWindow):
         self.main_btn.setText("启动服务")
         self.main_btn.setObjectName("action_btn_start")
         self.main_btn.setStyle(self.main_btn.style())
+        self.ready_started_at = None
         self.path_input.setEnabled(True)
         self.app_combo.setEnabled(True)
         self.python_input.setEnabled(True)
         self.python_browse_btn.setEnabled(True)
+        self.record_check.setEnabled(True)
+        self._stop_proxy()
         self.log_view.appendPlainText(">> 服务已退出。")
 
     def on_output(self):
@@ -665,6 +1337,11 @@ class UvicornController(QMainWindow):
         if d:
             self.log_view.appendPlainText(d.strip())
             self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+            if "Reloading..." in d:
+                self.ready_kind = "reload"
+                self.ready_started_at = time.monotonic()
+            if "Application startup complete" in d:
+                self._on_ready()
 
     def closeEvent(self, event):
         event.ignore()
@@ -672,6 +1349,8 @@ class UvicornController(QMainWindow):
         self.tray.showMessage("Uvicorn Launcher", "已最小化到托盘", QSystemTrayIcon.MessageIcon.Information, 1000)
 
     def exit_app(self):
+        self.pending_launch = None
+        self._abort_prewarm()
         if self.is_running():
             pid = self.process.processId() or self.last_pid
             if pid:
@@ -681,6 +1360,7 @@ class UvicornController(QMainWindow):
             self.process.waitForFinished(2000)
             if self.is_running():
                 self.process.kill()
+        self._stop_proxy()
         QApplication.quit()
 
 